@@ -2,16 +2,18 @@
 
 import anyio
 from kiro_agent_sdk import query, KiroAgentOptions
-from kiro_agent_sdk.types import AssistantMessage, TextBlock
 
 
 async def main():
     """Run a simple query."""
+    # Dispatching on the role/type discriminator strings is a plain
+    # string compare per message/block — cheaper than isinstance checks
+    # on busy streams, and no type imports needed.
     print("=== Simple Query ===")
     async for message in query(prompt="What is 2 + 2?"):
-        if isinstance(message, AssistantMessage):
+        if message.role == "assistant":
             for block in message.content:
-                if isinstance(block, TextBlock):
+                if block.type == "text":
                     print(block.text)
 
     print("\n=== Query with Options ===")
@@ -21,9 +23,9 @@ async def main():
     )
 
     async for message in query(prompt="Explain prime numbers", options=options):
-        if isinstance(message, AssistantMessage):
+        if message.role == "assistant":
             for block in message.content:
-                if isinstance(block, TextBlock):
+                if block.type == "text":
                     print(block.text)
 
 
@@ -2,12 +2,32 @@
 
 from kiro_agent_sdk._version import __version__
 from kiro_agent_sdk.client import KiroSDKClient
-from kiro_agent_sdk.query import query
+from kiro_agent_sdk.query import query, query_batched
 from kiro_agent_sdk.types import KiroAgentOptions
 
+
+def use_uvloop() -> None:
+    """Install uvloop as the asyncio event loop policy.
+
+    uvloop's C-level stream transports cut per-read overhead on the
+    kiro-cli pipes substantially. This is opt-in: call it once at
+    startup, before creating any event loop.
+
+    Raises:
+        ImportError: If uvloop is not installed (``pip install uvloop``).
+    """
+    import asyncio
+
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 __all__ = [
     "__version__",
     "KiroSDKClient",
     "query",
+    "query_batched",
     "KiroAgentOptions",
+    "use_uvloop",
 ]
@@ -1,6 +1,7 @@
 """Message parser for converting JSON to typed messages."""
 
-from typing import Any
+from collections.abc import Callable
+from typing import Any, cast
 
 from kiro_agent_sdk.types import (
     AssistantMessage,
@@ -12,45 +13,87 @@ from kiro_agent_sdk.types import (
 )
 
 
+def _parse_text(block: dict[str, Any]) -> TextBlock:
+    return TextBlock(text=block["text"])
+
+
+def _parse_tool_use(block: dict[str, Any]) -> ToolUseBlock:
+    return ToolUseBlock(
+        id=block["id"],
+        name=block["name"],
+        input=block["input"]
+    )
+
+
+def _parse_tool_result(block: dict[str, Any]) -> ToolResultBlock:
+    return ToolResultBlock(
+        tool_use_id=block["tool_use_id"],
+        content=block["content"],
+        is_error=block.get("is_error", False)
+    )
+
+
+# Dispatch tables: a single dict lookup replaces an if/elif ladder of
+# string comparisons on the per-block hot path.
+_BLOCK_PARSERS: dict[
+    str, Callable[[dict[str, Any]], TextBlock | ToolUseBlock | ToolResultBlock]
+] = {
+    "text": _parse_text,
+    "tool_use": _parse_tool_use,
+    "tool_result": _parse_tool_result,
+}
+
+
 def parse_content_block(block: dict[str, Any]) -> TextBlock | ToolUseBlock | ToolResultBlock:
     """Parse a content block from JSON."""
-    block_type = block.get("type")
-
-    if block_type == "text":
+    # Fast path: text blocks dominate real streams, so skip the dispatch
+    # table for them.
+    if block.get("type") == "text":
         return TextBlock(text=block["text"])
-    elif block_type == "tool_use":
-        return ToolUseBlock(
-            id=block["id"],
-            name=block["name"],
-            input=block["input"]
-        )
-    elif block_type == "tool_result":
-        return ToolResultBlock(
-            tool_use_id=block["tool_use_id"],
-            content=block["content"],
-            is_error=block.get("is_error", False)
-        )
-    else:
-        raise ValueError(f"Unknown content block type: {block_type}")
+
+    try:
+        parser = _BLOCK_PARSERS[block["type"]]
+    except KeyError:
+        raise ValueError(f"Unknown content block type: {block.get('type')}") from None
+    return parser(block)
+
+
+def _parse_assistant(data: dict[str, Any]) -> AssistantMessage:
+    # list(map(...)) pre-sizes from the array length and iterates in C
+    content = list(map(parse_content_block, data["content"]))
+    return AssistantMessage(content=cast("list[TextBlock | ToolUseBlock]", content))
+
+
+def _parse_user(data: dict[str, Any]) -> UserMessage:
+    # list(map(...)) pre-sizes from the array length and iterates in C
+    content = list(map(parse_content_block, data["content"]))
+    return UserMessage(content=cast("list[TextBlock]", content))
+
+
+def _parse_tool_result_message(data: dict[str, Any]) -> ToolResultMessage:
+    # list(map(...)) pre-sizes from the array length and iterates in C
+    content = list(map(parse_content_block, data["content"]))
+    return ToolResultMessage(
+        tool_use_id=data["tool_use_id"],
+        content=cast("list[TextBlock]", content)
+    )
+
+
+_MESSAGE_PARSERS: dict[
+    str, Callable[[dict[str, Any]], AssistantMessage | UserMessage | ToolResultMessage]
+] = {
+    "assistant": _parse_assistant,
+    "user": _parse_user,
+    "tool_result": _parse_tool_result_message,
+}
 
 
 def parse_message(
     data: dict[str, Any]
 ) -> AssistantMessage | UserMessage | ToolResultMessage:
     """Parse a message from JSON."""
-    role = data.get("role")
-
-    if role == "assistant":
-        content = [parse_content_block(block) for block in data["content"]]
-        return AssistantMessage(content=content)
-    elif role == "user":
-        content = [parse_content_block(block) for block in data["content"]]
-        return UserMessage(content=content)
-    elif role == "tool_result":
-        content = [parse_content_block(block) for block in data["content"]]
-        return ToolResultMessage(
-            tool_use_id=data["tool_use_id"],
-            content=content
-        )
-    else:
-        raise ValueError(f"Unknown message role: {role}")
+    try:
+        parser = _MESSAGE_PARSERS[data["role"]]
+    except KeyError:
+        raise ValueError(f"Unknown message role: {data.get('role')}") from None
+    return parser(data)
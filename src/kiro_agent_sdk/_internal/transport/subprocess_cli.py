@@ -3,16 +3,164 @@
 import asyncio
 import json
 import os
-from collections.abc import AsyncIterator
+import re
+import shutil
+import sys
+from collections.abc import AsyncGenerator, Callable
+from functools import lru_cache
 from typing import Any
 
 from kiro_agent_sdk._errors import CLIJSONDecodeError, CLINotFoundError
 from kiro_agent_sdk.types import KiroAgentOptions
 
+# orjson encodes/decodes JSON several times faster than the stdlib
+# parser, which matters on the per-message send/receive paths. msgspec's
+# C codec is in the same class, and ujson still beats stdlib on the
+# platforms where neither ships a wheel (musl, some ARM); plain json is
+# the last resort. The chosen codec is bound to module-level _loads /
+# _dumps names so the hot paths pay one global load, not an attribute
+# walk. _dumps always returns bytes.
+_loads: Callable[[bytes], Any]
+_dumps: Callable[[Any], bytes]
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    try:
+        import msgspec.json
+
+        _loads = msgspec.json.decode
+        _dumps = msgspec.json.encode
+    except ImportError:
+        try:
+            import ujson
+
+            _loads = ujson.loads
+
+            def _dumps(obj: Any) -> bytes:
+                return ujson.dumps(obj).encode()
+        except ImportError:
+            _loads = json.loads
+
+            def _dumps(obj: Any) -> bytes:
+                # Compact separators match what the C codecs emit and
+                # trim ~10% off multi-KB payloads written to stdin.
+                return json.dumps(obj, separators=(",", ":")).encode()
+
+
+# Bytes pulled per read() in the receive loop. Reading through the
+# StreamReader (rather than loop.add_reader on the raw pipe fd) keeps
+# asyncio's flow control; at this chunk size the protocol overhead is
+# already amortized to one callback per ~64 KiB.
+_READ_CHUNK = 65536
+
+# Matches non-blank lines: a run without newlines containing at least
+# one non-whitespace byte. One finditer pass over a buffered region
+# both splits it into lines and drops blank ones in C.
+_LINE_RE = re.compile(rb"[^\r\n]*[^ \t\r\n][^\r\n]*")
+
+# Fixed argv tail shared by every invocation (the CLI path varies).
+_BASE_CMD = ("chat", "--no-interactive")
+
+
+@lru_cache(maxsize=1)
+def _max_pipe_size() -> int:
+    """Largest pipe buffer an unprivileged process may request.
+
+    F_SETPIPE_SZ above fs.pipe-max-size (1 MiB on stock kernels) fails
+    with EPERM, so pipesize requests must be clamped to it. Falls back
+    to the kernel's default pipe capacity if the sysctl is unreadable.
+    """
+    try:
+        with open("/proc/sys/fs/pipe-max-size") as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return 65536
+
+
+@lru_cache(maxsize=1)
+def _install_child_watcher() -> None:
+    """Use pidfd-based child reaping on Linux where available.
+
+    The default ThreadedChildWatcher spawns a waiter thread per child;
+    PidfdChildWatcher reaps through the event loop instead. Python 3.12+
+    does this natively (and deprecates set_child_watcher), so only older
+    runtimes need the explicit opt-in. Cached so the probe runs once.
+    """
+    if sys.version_info >= (3, 12):
+        return
+    if sys.platform != "linux" or not hasattr(os, "pidfd_open"):
+        return
+
+    try:
+        # Probe kernel support (pidfd needs Linux >= 5.3).
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return
+
+    # The watcher must be attached to a loop before it reports active;
+    # installing it unattached makes every later subprocess spawn raise.
+    watcher = asyncio.PidfdChildWatcher()
+    watcher.attach_loop(asyncio.get_running_loop())
+    asyncio.set_child_watcher(watcher)
+
+
+@lru_cache(maxsize=32)
+def _resolve_cli_path(explicit: str | None, path_env: str) -> str:
+    """Resolve the CLI executable once per (override, PATH) pair.
+
+    Resolving to an absolute path up front avoids a PATH walk inside
+    every exec. Keying on PATH keeps the cache correct if the
+    environment changes mid-process; if the CLI isn't on PATH, fall
+    back to the bare name so spawn-time error handling stays in one
+    place.
+    """
+    if explicit:
+        return explicit
+
+    # TODO: Check for bundled CLI
+
+    return shutil.which("kiro-cli") or "kiro-cli"
+
+
+@lru_cache(maxsize=32)
+def _build_command_cached(
+    cli_path: str,
+    allowed_tools: str | None,
+    trust_all_tools: bool,
+    resume_session: str | None,
+    verbose: int,
+) -> tuple[str, ...]:
+    """Build the CLI argv for one combination of option values."""
+    cmd = [cli_path, *_BASE_CMD]
+
+    # Add tool configuration (already comma-joined by KiroAgentOptions)
+    if allowed_tools:
+        cmd.extend(("--trust-tools", allowed_tools))
+    if trust_all_tools:
+        cmd.append("--trust-all-tools")
+
+    # Add session management
+    if resume_session:
+        cmd.extend(("--resume", resume_session))
+
+    # Add verbosity (stacked short form: -v, -vv, ...)
+    if verbose:
+        cmd.append("-" + "v" * verbose)
+
+    return tuple(cmd)
+
 
 class KiroSubprocessTransport:
     """Manages kiro-cli subprocess communication."""
 
+    # Grace period for terminate() before escalating to kill().
+    # Class-level so tests (and embedders) can shorten it.
+    TERMINATE_TIMEOUT = 5.0
+
     def __init__(self) -> None:
         self.process: asyncio.subprocess.Process | None = None
 
@@ -24,39 +172,46 @@ class KiroSubprocessTransport:
         2. Bundled CLI (TODO)
         3. System kiro-cli in PATH
         """
-        if options.cli_path:
-            return options.cli_path
-
-        # TODO: Check for bundled CLI
-
-        return "kiro-cli"
+        return _resolve_cli_path(options.cli_path, os.environ.get("PATH", ""))
 
     def _build_command(self, options: KiroAgentOptions) -> list[str]:
-        """Build CLI command with arguments."""
-        cmd = [self._get_cli_path(options), "chat", "--no-interactive"]
-
-        # Add tool configuration
-        if options.allowed_tools:
-            cmd.extend(["--trust-tools", ",".join(options.allowed_tools)])
-        if options.trust_all_tools:
-            cmd.append("--trust-all-tools")
+        """Build CLI command with arguments.
 
-        # Add session management
-        if options.resume_session:
-            cmd.extend(["--resume", options.resume_session])
-
-        # Add verbosity
-        if options.verbose:
-            cmd.extend(["-v"] * options.verbose)
-
-        return cmd
+        The argv is memoized on the option values it depends on, so
+        repeated starts with equivalent options rebuild it only once.
+        """
+        cached = _build_command_cached(
+            self._get_cli_path(options),
+            *options._command_key,
+        )
+        # Copy so callers can't mutate the cache entry.
+        return list(cached)
 
     async def start(self, options: KiroAgentOptions) -> None:
         """Start kiro-cli subprocess."""
+        _install_child_watcher()
+
         cmd = self._build_command(options)
 
-        # Determine working directory
-        cwd = str(options.cwd) if options.cwd else os.getcwd()
+        # Resolve a bare executable name (e.g. an explicit cli_path of
+        # "kiro") to an absolute path so execvp doesn't walk PATH in the
+        # child on every spawn. The default path is already resolved.
+        if not os.path.isabs(cmd[0]):
+            resolved = shutil.which(cmd[0])
+            if resolved:
+                cmd[0] = resolved
+
+        # Determine working directory; None lets the child inherit ours
+        # without a getcwd() syscall here.
+        cwd = str(options.cwd) if options.cwd else None
+
+        spawn_kwargs: dict[str, Any] = {}
+        if sys.platform == "linux":
+            # Larger kernel pipes mean fewer read syscalls per message.
+            # Clamped so a stdout_limit above fs.pipe-max-size doesn't
+            # turn into EPERM at spawn; the StreamReader limit stays at
+            # the full requested size.
+            spawn_kwargs["pipesize"] = min(options.stdout_limit, _max_pipe_size())
 
         try:
             self.process = await asyncio.create_subprocess_exec(
@@ -65,6 +220,8 @@ class KiroSubprocessTransport:
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 cwd=cwd,
+                limit=options.stdout_limit,
+                **spawn_kwargs,
             )
         except FileNotFoundError as e:
             raise CLINotFoundError(
@@ -72,41 +229,118 @@ class KiroSubprocessTransport:
                 "Please install kiro-cli or specify cli_path in options."
             ) from e
 
+        if self.process.stdin is not None:
+            # Zero high-water mark: drain() in send_message then applies
+            # backpressure immediately instead of letting large prompts
+            # pile up in the write buffer while the child is busy.
+            self.process.stdin.transport.set_write_buffer_limits(high=0)
+
     async def stop(self) -> None:
-        """Stop kiro-cli subprocess gracefully."""
+        """Stop kiro-cli subprocess gracefully.
+
+        Returns as soon as the child exits; the timeout is only the
+        upper bound before escalating to kill().
+        """
         if not self.process:
             return
 
-        self.process.terminate()
+        # A normally-completed query leaves the child already exited and
+        # reaped by the time stop() runs; signalling it then raises
+        # ProcessLookupError. The returncode check covers the common
+        # case, the except the race where it exits in between.
+        if self.process.returncode is not None:
+            return
+
         try:
-            await asyncio.wait_for(self.process.wait(), timeout=5.0)
+            self.process.terminate()
+        except ProcessLookupError:
+            return
+
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=self.TERMINATE_TIMEOUT)
         except asyncio.TimeoutError:
-            self.process.kill()
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                return
             await self.process.wait()
 
     async def send_message(self, message: dict[str, Any]) -> None:
-        """Send JSON message to CLI stdin."""
+        """Send JSON message to CLI stdin.
+
+        Waits for the write buffer to drain before returning, so a slow
+        child can't deadlock against us on large prompts. Callers
+        embedding very large context (>1 MiB) should chunk it across
+        multiple messages.
+        """
         if not self.process or not self.process.stdin:
             raise RuntimeError("Process not started")
 
-        data = json.dumps(message) + "\n"
-        self.process.stdin.write(data.encode())
+        # writelines hands both chunks to the transport in one call,
+        # skipping the payload+newline concatenation copy.
+        self.process.stdin.writelines((_dumps(message), b"\n"))
         await self.process.stdin.drain()
 
-    async def receive_messages(self) -> AsyncIterator[dict[str, Any]]:
+    async def receive_messages(self) -> AsyncGenerator[dict[str, Any], None]:
         """Stream JSON messages from CLI stdout."""
         if not self.process or not self.process.stdout:
             raise RuntimeError("Process not started")
 
-        async for line in self.process.stdout:
-            line_str = line.decode().strip()
-            if not line_str:
+        # Read in bulk rather than line-by-line: one await per ~64 KiB
+        # chunk instead of per line amortizes StreamReader overhead on
+        # bursty output.
+        buf = bytearray()
+        start = 0  # offset of unconsumed data within buf
+        while True:
+            chunk = await self.process.stdout.read(_READ_CHUNK)
+            if not chunk:
+                break
+            buf += chunk
+
+            # Split and blank-filter the complete region (everything up
+            # to the last newline) in a single regex pass instead of a
+            # find/del loop per line.
+            end = buf.rfind(b"\n", start)
+            if end == -1:
                 continue
+            for match in _LINE_RE.finditer(buf, start, end):
+                message = self._parse_line(match.group())
+                if message is not None:
+                    yield message
+            start = end + 1
 
-            try:
-                yield json.loads(line_str)
-            except json.JSONDecodeError as e:
-                raise CLIJSONDecodeError(
-                    f"Failed to parse JSON from CLI: {e}",
-                    raw_output=line_str
-                ) from e
+            # Compact lazily: advancing start is free, while deleting
+            # the consumed prefix memmoves the tail. Only pay for the
+            # memmove once a full chunk's worth has been consumed.
+            if start > _READ_CHUNK:
+                del buf[:start]
+                start = 0
+
+        # Trailing data without a final newline (e.g. on process exit).
+        if start < len(buf):
+            message = self._parse_line(bytes(buf[start:]))
+            if message is not None:
+                yield message
+
+    def _parse_line(self, line: bytes) -> dict[str, Any] | None:
+        """Parse one NDJSON line, returning None for blank lines.
+
+        The raw bytes go straight to the JSON decoder — every supported
+        decoder accepts bytes, so the only UTF-8 scan happens inside the
+        parser. Decoding to str is deferred to the error path.
+        """
+        line = line.strip()
+        if not line:
+            return None
+
+        try:
+            message: dict[str, Any] = _loads(line)
+            return message
+        except ValueError as e:
+            # errors="replace": malformed UTF-8 is one plausible cause of
+            # a decode failure, and the exception should still carry the
+            # offending line rather than raise a second error.
+            raise CLIJSONDecodeError(
+                f"Failed to parse JSON from CLI: {e}",
+                raw_output=line.decode("utf-8", errors="replace")
+            ) from e
@@ -1,6 +1,9 @@
 """Simple query API for Kiro Agent SDK."""
 
-from collections.abc import AsyncIterator
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Any
 
 from kiro_agent_sdk._internal.message_parser import parse_message
 from kiro_agent_sdk._internal.transport.subprocess_cli import KiroSubprocessTransport
@@ -11,11 +14,32 @@ from kiro_agent_sdk.types import (
     KiroAgentOptions,
 )
 
+_Message = AssistantMessage | UserMessage | ToolResultMessage
+
+# Shared immutable defaults: avoids re-allocating an options object on
+# every query() call that doesn't pass one.
+_DEFAULT_OPTIONS = KiroAgentOptions()
+
+# Marks end-of-stream on the internal message queue. Typed Any so it
+# can pass through queues carrying message dicts.
+_SENTINEL: Any = object()
+
+# Messages buffered between the stdout reader task and the consumer. A
+# small bound keeps a slow consumer from buffering unboundedly while
+# still letting the reader run ahead and drain the subprocess pipe.
+_QUEUE_SIZE = 8
+
+# Upper bound on one coalesced batch. The batch window is a gap timer,
+# so a stream whose inter-message gaps all stay under the window would
+# otherwise grow a single batch — and the consumer's first-output
+# latency — without bound.
+_MAX_BATCH_SIZE = 64
+
 
 async def query(
     prompt: str,
     options: KiroAgentOptions | None = None,
-) -> AsyncIterator[AssistantMessage | UserMessage | ToolResultMessage]:
+) -> AsyncIterator[_Message]:
     """Execute a simple query against Kiro Agent.
 
     Args:
@@ -32,7 +56,7 @@ async def query(
         ```
     """
     if options is None:
-        options = KiroAgentOptions()
+        options = _DEFAULT_OPTIONS
 
     transport = KiroSubprocessTransport()
 
@@ -46,11 +70,148 @@ async def query(
             "content": prompt
         })
 
-        # Stream responses
-        async for message_data in transport.receive_messages():
-            message = parse_message(message_data)
-            yield message
+        # Stream responses. A pump task reads the subprocess pipe into a
+        # bounded queue so a slow consumer doesn't stall the reader (and
+        # eventually the child, once the pipe fills).
+        # aclosing() finalizes the inner generator (and with it the
+        # pump task) deterministically if the caller abandons us early,
+        # instead of leaving that to the garbage collector.
+        async with contextlib.aclosing(_receive_decoupled(transport)) as messages:
+            async for message in messages:
+                yield message
 
     finally:
-        # Always stop transport
+        # Ensure cleanup
         await transport.stop()
+
+
+async def query_batched(
+    prompt: str,
+    options: KiroAgentOptions | None = None,
+) -> AsyncIterator[list[_Message]]:
+    """Execute a query, yielding messages coalesced into lists.
+
+    Messages arriving within ``options.batch_window_ms`` of each other
+    are grouped into one list, cutting per-message event-loop hops for
+    CPU-heavy consumers. With a window of 0, each list holds whatever
+    is already buffered when the consumer asks — usually one message.
+
+    Args:
+        prompt: The prompt/question to send
+        options: Optional configuration options
+
+    Yields:
+        Non-empty lists of messages from the agent
+
+    Example:
+        ```python
+        options = KiroAgentOptions(batch_window_ms=10)
+        async for batch in query_batched(prompt="Summarize...", options=options):
+            process(batch)
+        ```
+    """
+    if options is None:
+        options = _DEFAULT_OPTIONS
+
+    transport = KiroSubprocessTransport()
+
+    try:
+        await transport.start(options)
+
+        await transport.send_message({
+            "role": "user",
+            "content": prompt
+        })
+
+        async with contextlib.aclosing(
+            _receive_batches(transport, options.batch_window_ms / 1000)
+        ) as batches:
+            async for batch in batches:
+                yield batch
+
+    finally:
+        # Ensure cleanup
+        await transport.stop()
+
+
+async def _pump(
+    transport: KiroSubprocessTransport, queue: "asyncio.Queue[dict[str, Any]]"
+) -> None:
+    """Read raw messages off the transport into the queue."""
+    try:
+        # aclosing() finalizes the receive generator even when this
+        # task is cancelled, rather than leaving it to the GC.
+        async with contextlib.aclosing(transport.receive_messages()) as stream:
+            async for message_data in stream:
+                await queue.put(message_data)
+    except asyncio.CancelledError:
+        # Cancelled by an abandoning consumer: nobody drains the queue
+        # anymore, so putting the sentinel could block this task forever
+        # on a full queue. Let the cancellation through instead.
+        raise
+    except BaseException:
+        await queue.put(_SENTINEL)
+        raise
+    else:
+        await queue.put(_SENTINEL)
+
+
+async def _receive_decoupled(
+    transport: KiroSubprocessTransport,
+) -> AsyncGenerator[_Message, None]:
+    """Yield parsed messages while a pump task keeps the pipe drained."""
+    queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=_QUEUE_SIZE)
+    pump_task = asyncio.create_task(_pump(transport, queue))
+
+    try:
+        while (item := await queue.get()) is not _SENTINEL:
+            yield parse_message(item)
+
+        # Re-raise any error the pump hit (e.g. CLIJSONDecodeError).
+        await pump_task
+    finally:
+        pump_task.cancel()
+        # Make sure the pump cannot outlive the generator.
+        with contextlib.suppress(asyncio.CancelledError):
+            await pump_task
+
+
+async def _receive_batches(
+    transport: KiroSubprocessTransport,
+    window: float,
+) -> AsyncGenerator[list[_Message], None]:
+    """Coalesce messages arriving within ``window`` seconds into lists.
+
+    Batches are capped at ``_MAX_BATCH_SIZE`` messages so a dense
+    stream still yields regularly.
+    """
+    queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=_QUEUE_SIZE)
+    pump_task = asyncio.create_task(_pump(transport, queue))
+
+    try:
+        done = False
+        while not done:
+            item = await queue.get()
+            if item is _SENTINEL:
+                break
+
+            batch = [parse_message(item)]
+            while len(batch) < _MAX_BATCH_SIZE:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=window)
+                except asyncio.TimeoutError:
+                    break
+                if item is _SENTINEL:
+                    done = True
+                    break
+                batch.append(parse_message(item))
+
+            yield batch
+
+        # Re-raise any error the pump hit (e.g. CLIJSONDecodeError).
+        await pump_task
+    finally:
+        pump_task.cancel()
+        # Make sure the pump cannot outlive the generator.
+        with contextlib.suppress(asyncio.CancelledError):
+            await pump_task
@@ -1,66 +1,157 @@
 """Type definitions for Kiro Agent SDK."""
 
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, cast
 
+# Interned discriminator constants. Every block/message of a kind
+# shares one string object for its type/role field (the fields are
+# init=False, so instances always get these defaults), and comparisons
+# against source-literal strings hit the pointer-equality fast path.
+_TEXT = sys.intern("text")
+_TOOL_USE = sys.intern("tool_use")
+_TOOL_RESULT = sys.intern("tool_result")
+_ASSISTANT = sys.intern("assistant")
+_USER = sys.intern("user")
 
-@dataclass
+
+@dataclass(slots=True)
 class TextBlock:
     """Text content block."""
 
     text: str
-    type: str = field(default="text", init=False)
+    type: str = field(default=_TEXT, init=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolUseBlock:
     """Tool use block from assistant."""
 
     id: str
     name: str
     input: dict[str, Any]
-    type: str = field(default="tool_use", init=False)
+    type: str = field(default=_TOOL_USE, init=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResultBlock:
     """Tool result block."""
 
     tool_use_id: str
     content: str
     is_error: bool = False
-    type: str = field(default="tool_result", init=False)
-
-
-@dataclass
+    type: str = field(default=_TOOL_RESULT, init=False)
+
+
+def _message_text(message: "AssistantMessage | UserMessage | ToolResultMessage") -> str:
+    """Concatenated text of a message's content, cached per instance.
+
+    The common shape is a single TextBlock, which is returned without
+    iterating. Comparing the stored ``type`` string (one slot load on
+    these classes) avoids an isinstance check per block. cached_property
+    needs a __dict__, which slotted dataclasses don't have, so the
+    result is cached in an explicit slot instead.
+    """
+    text = message._text
+    if text is None:
+        content = message.content
+        # The casts are free at runtime; the type check on the stored
+        # discriminator is what guarantees them.
+        if len(content) == 1 and content[0].type == "text":
+            text = cast(TextBlock, content[0]).text
+        else:
+            text = "".join(
+                cast(TextBlock, block).text for block in content if block.type == "text"
+            )
+        message._text = text
+    return text
+
+
+@dataclass(slots=True)
 class AssistantMessage:
     """Message from assistant."""
 
     content: list[TextBlock | ToolUseBlock]
-    role: str = field(default="assistant", init=False)
+    role: str = field(default=_ASSISTANT, init=False)
+    _text: str | None = field(default=None, init=False, repr=False, compare=False)
 
+    @property
+    def text(self) -> str:
+        """Concatenated text content (cached)."""
+        return _message_text(self)
 
-@dataclass
+
+@dataclass(slots=True)
 class UserMessage:
     """Message from user."""
 
     content: list[TextBlock]
-    role: str = field(default="user", init=False)
+    role: str = field(default=_USER, init=False)
+    _text: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def text(self) -> str:
+        """Concatenated text content (cached)."""
+        return _message_text(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResultMessage:
     """Tool result message."""
 
     tool_use_id: str
     content: list[TextBlock]
-    role: str = field(default="tool_result", init=False)
-
-
-@dataclass
+    role: str = field(default=_TOOL_RESULT, init=False)
+    _text: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def text(self) -> str:
+        """Concatenated text content (cached)."""
+        return _message_text(self)
+
+
+# Dispatch tables from the wire discriminators to the concrete types:
+# consumers working with raw dicts can map them with one dict lookup
+# instead of an isinstance or if/elif chain.
+BLOCK_TYPES: dict[str, type] = {
+    _TEXT: TextBlock,
+    _TOOL_USE: ToolUseBlock,
+    _TOOL_RESULT: ToolResultBlock,
+}
+
+MESSAGE_TYPES: dict[str, type] = {
+    _ASSISTANT: AssistantMessage,
+    _USER: UserMessage,
+    _TOOL_RESULT: ToolResultMessage,
+}
+
+
+def block_from_dict(data: dict[str, Any]) -> TextBlock | ToolUseBlock | ToolResultBlock:
+    """Build a typed content block from a raw JSON dict."""
+    cls = BLOCK_TYPES[data["type"]]
+    block = cls(**{k: v for k, v in data.items() if k != "type"})
+    return cast("TextBlock | ToolUseBlock | ToolResultBlock", block)
+
+
+def message_from_dict(
+    data: dict[str, Any]
+) -> AssistantMessage | UserMessage | ToolResultMessage:
+    """Build a typed message (with typed content blocks) from a raw JSON dict."""
+    cls = MESSAGE_TYPES[data["role"]]
+    content = [block_from_dict(block) for block in data["content"]]
+    kwargs = {k: v for k, v in data.items() if k not in ("role", "content")}
+    message = cls(content=content, **kwargs)
+    return cast("AssistantMessage | UserMessage | ToolResultMessage", message)
+
+
+@dataclass(frozen=True, slots=True)
 class KiroAgentOptions:
-    """Configuration options for Kiro Agent."""
+    """Configuration options for Kiro Agent.
+
+    Instances are immutable so they can be shared safely across queries
+    and clients.
+    """
 
     # Agent configuration
     system_prompt: str | None = None
@@ -68,8 +159,9 @@ class KiroAgentOptions:
     max_turns: int | None = None
     temperature: float | None = None
 
-    # Tool configuration
-    allowed_tools: list[str] | None = None
+    # Tool configuration (lists are normalized to tuples so options
+    # stay hashable and safe to use as cache keys)
+    allowed_tools: tuple[str, ...] | list[str] | None = None
     trust_all_tools: bool = False
 
     # MCP server configuration
@@ -82,11 +174,52 @@ class KiroAgentOptions:
     cli_path: str | None = None
     verbose: int = 0
 
+    # Transport tuning: max size of a single stdout line (and, on Linux,
+    # the kernel pipe buffer). Large tool results can exceed asyncio's
+    # default 64 KiB StreamReader limit.
+    stdout_limit: int = 1 << 20
+
     # Session
     resume_session: str | None = None
 
-
-@dataclass
+    # Coalescing window for query_batched(): messages arriving within
+    # this many milliseconds of each other are grouped into one list.
+    batch_window_ms: int = 0
+
+    # Derived once at construction; the options are immutable, so the
+    # transport never has to re-join the tool list.
+    _allowed_tools_joined: str | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # The option values the CLI argv depends on, snapshotted as one
+    # tuple so the transport's memoized command builder is keyed (and
+    # fed) with a single attribute load per start.
+    _command_key: tuple[Any, ...] = field(
+        default=(), init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.allowed_tools is not None:
+            object.__setattr__(self, "allowed_tools", tuple(self.allowed_tools))
+        object.__setattr__(
+            self,
+            "_allowed_tools_joined",
+            ",".join(self.allowed_tools) if self.allowed_tools else None,
+        )
+        object.__setattr__(
+            self,
+            "_command_key",
+            (
+                self._allowed_tools_joined,
+                self.trust_all_tools,
+                self.resume_session,
+                self.verbose,
+            ),
+        )
+
+
+@dataclass(slots=True)
 class SessionInfo:
     """Information about a session."""
 
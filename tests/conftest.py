@@ -3,6 +3,99 @@
 import pytest
 
 
+class BytesStreamMock:
+    """Minimal asyncio StreamReader stand-in serving bytes in chunks.
+
+    Lets transport tests exercise the buffered read loop, including
+    reads that split a line across chunk boundaries.
+    """
+
+    def __init__(self, data: bytes, chunk_size: int = 65536) -> None:
+        self._data = data
+        self._pos = 0
+        self._chunk_size = chunk_size
+
+    async def read(self, n: int = -1) -> bytes:
+        size = self._chunk_size if n < 0 else min(n, self._chunk_size)
+        chunk = self._data[self._pos:self._pos + size]
+        self._pos += len(chunk)
+        return chunk
+
+
+class _StdinTransport:
+    """Records the write-buffer limits the transport configures."""
+
+    def __init__(self) -> None:
+        self.write_buffer_limits: tuple[int | None, int | None] | None = None
+
+    def set_write_buffer_limits(
+        self, high: int | None = None, low: int | None = None
+    ) -> None:
+        self.write_buffer_limits = (high, low)
+
+
+class FakeStdin:
+    """Hand-rolled StreamWriter stand-in recording written chunks.
+
+    Cheaper to construct than a MagicMock and lets tests assert on
+    ``writes`` directly instead of unpacking call_args.
+    """
+
+    def __init__(self) -> None:
+        self.writes: list[bytes] = []
+        self.drain_count = 0
+        self.transport = _StdinTransport()
+
+    def write(self, data: bytes) -> None:
+        self.writes.append(bytes(data))
+
+    def writelines(self, chunks) -> None:
+        self.writes.extend(bytes(chunk) for chunk in chunks)
+
+    async def drain(self) -> None:
+        self.drain_count += 1
+
+
+class FakeProcess:
+    """Hand-rolled asyncio subprocess stand-in for transport tests."""
+
+    def __init__(
+        self,
+        stdout_data: bytes = b"",
+        chunk_size: int = 65536,
+        exit_code: int = 0,
+    ) -> None:
+        self.stdin = FakeStdin()
+        self.stdout = BytesStreamMock(stdout_data, chunk_size)
+        self.stderr = None
+        self.returncode: int | None = None
+        self.terminated = False
+        self.killed = False
+        self._exit_code = exit_code
+
+    def terminate(self) -> None:
+        self.terminated = True
+
+    def kill(self) -> None:
+        self.killed = True
+
+    async def wait(self) -> int:
+        self.returncode = self._exit_code
+        return self.returncode
+
+
+@pytest.fixture
+def bytes_stream_mock():
+    """Factory for chunked stdout stream mocks."""
+    return BytesStreamMock
+
+
+@pytest.fixture
+def fake_process():
+    """Factory for hand-rolled subprocess stand-ins."""
+    return FakeProcess
+
+
 @pytest.fixture
 def mock_kiro_cli():
     """Mock kiro-cli for testing."""
@@ -1,9 +1,11 @@
 """Tests for query function."""
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from kiro_agent_sdk import query
+from kiro_agent_sdk import query, query_batched
 from kiro_agent_sdk.types import KiroAgentOptions, AssistantMessage, TextBlock
 
 
@@ -71,6 +73,101 @@ async def test_query_with_options():
         assert call_args[0].max_turns == 1
 
 
+@pytest.mark.asyncio
+async def test_query_batched_coalesces_messages():
+    """Test query_batched yields lists coalesced by the window."""
+    mock_transport = MagicMock()
+    mock_transport.start = AsyncMock()
+    mock_transport.send_message = AsyncMock()
+    mock_transport.stop = AsyncMock()
+
+    async def mock_receive():
+        yield {"role": "assistant", "content": [{"type": "text", "text": "Hello"}]}
+        yield {"role": "assistant", "content": [{"type": "text", "text": "World"}]}
+
+    mock_transport.receive_messages = mock_receive
+
+    options = KiroAgentOptions(batch_window_ms=100)
+
+    with patch(
+        "kiro_agent_sdk.query.KiroSubprocessTransport",
+        return_value=mock_transport
+    ):
+        batches = []
+        async for batch in query_batched(prompt="Hi", options=options):
+            batches.append(batch)
+
+        # Both messages arrive back-to-back, well inside the window
+        assert len(batches) == 1
+        assert len(batches[0]) == 2
+        assert all(isinstance(message, AssistantMessage) for message in batches[0])
+
+
+@pytest.mark.asyncio
+async def test_query_batched_caps_batch_size():
+    """Test a dense stream is split at the batch-size cap."""
+    from kiro_agent_sdk.query import _MAX_BATCH_SIZE
+
+    mock_transport = MagicMock()
+    mock_transport.start = AsyncMock()
+    mock_transport.send_message = AsyncMock()
+    mock_transport.stop = AsyncMock()
+
+    total = _MAX_BATCH_SIZE + 6
+
+    async def mock_receive():
+        for i in range(total):
+            yield {"role": "assistant", "content": [{"type": "text", "text": str(i)}]}
+
+    mock_transport.receive_messages = mock_receive
+
+    options = KiroAgentOptions(batch_window_ms=100)
+
+    with patch(
+        "kiro_agent_sdk.query.KiroSubprocessTransport",
+        return_value=mock_transport
+    ):
+        batches = []
+        async for batch in query_batched(prompt="Hi", options=options):
+            batches.append(batch)
+
+        # All messages delivered, no batch above the cap
+        assert sum(len(batch) for batch in batches) == total
+        assert max(len(batch) for batch in batches) == _MAX_BATCH_SIZE
+
+
+@pytest.mark.asyncio
+async def test_query_abandoned_early_leaves_no_pending_tasks():
+    """Test breaking out of query() doesn't leak a blocked pump task."""
+    mock_transport = MagicMock()
+    mock_transport.start = AsyncMock()
+    mock_transport.send_message = AsyncMock()
+    mock_transport.stop = AsyncMock()
+
+    async def mock_receive():
+        # Far more than the internal queue bound, so the pump is
+        # blocked mid-put when the consumer walks away.
+        for i in range(100):
+            yield {"role": "assistant", "content": [{"type": "text", "text": str(i)}]}
+
+    mock_transport.receive_messages = mock_receive
+
+    with patch(
+        "kiro_agent_sdk.query.KiroSubprocessTransport",
+        return_value=mock_transport
+    ):
+        stream = query(prompt="Hi")
+        async for message in stream:
+            break
+        await stream.aclose()
+
+        pending = [
+            task for task in asyncio.all_tasks() if task is not asyncio.current_task()
+        ]
+        assert pending == []
+        mock_transport.stop.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 async def test_query_stops_transport_on_error():
     """Test query stops transport even if error occurs."""
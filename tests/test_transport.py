@@ -1,14 +1,33 @@
 """Tests for subprocess transport."""
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+import json
+from unittest.mock import patch
 
 import pytest
 from kiro_agent_sdk._errors import CLIJSONDecodeError
-from kiro_agent_sdk._internal.transport.subprocess_cli import KiroSubprocessTransport
+from kiro_agent_sdk._internal.transport.subprocess_cli import (
+    KiroSubprocessTransport,
+    _resolve_cli_path,
+)
 from kiro_agent_sdk.types import KiroAgentOptions
 
 
+@pytest.fixture
+def no_cli_on_path():
+    """Pin path resolution to the bare-name fallback.
+
+    Any test that reaches _get_cli_path must use this (or patch
+    shutil.which itself): the resolver consults the real PATH and
+    caches per PATH value, so results would otherwise depend on
+    whether the host has kiro-cli installed.
+    """
+    _resolve_cli_path.cache_clear()
+    with patch("shutil.which", return_value=None):
+        yield
+    _resolve_cli_path.cache_clear()
+
+
 @pytest.mark.asyncio
 async def test_transport_initialization():
     """Test transport can be initialized."""
@@ -28,18 +47,35 @@ async def test_get_cli_path_from_options():
 
 
 @pytest.mark.asyncio
-async def test_get_cli_path_default():
+async def test_get_cli_path_default(no_cli_on_path):
     """Test default CLI path resolution."""
     transport = KiroSubprocessTransport()
     options = KiroAgentOptions()
 
     path = transport._get_cli_path(options)
-    # Should fall back to "kiro-cli" in PATH
+
+    # Should fall back to "kiro-cli" when not on PATH
     assert path == "kiro-cli"
 
 
 @pytest.mark.asyncio
-async def test_build_command_basic():
+async def test_get_cli_path_caches():
+    """Test default path resolution hits shutil.which only once."""
+    transport = KiroSubprocessTransport()
+    options = KiroAgentOptions()
+
+    _resolve_cli_path.cache_clear()
+    with patch("shutil.which", return_value="/usr/bin/kiro-cli") as mock_which:
+        path_one = transport._get_cli_path(options)
+        path_two = transport._get_cli_path(options)
+    _resolve_cli_path.cache_clear()
+
+    assert path_one == path_two == "/usr/bin/kiro-cli"
+    mock_which.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_build_command_basic(no_cli_on_path):
     """Test building basic CLI command."""
     transport = KiroSubprocessTransport()
     options = KiroAgentOptions()
@@ -49,7 +85,7 @@ async def test_build_command_basic():
 
 
 @pytest.mark.asyncio
-async def test_build_command_with_tools():
+async def test_build_command_with_tools(no_cli_on_path):
     """Test building command with allowed tools."""
     transport = KiroSubprocessTransport()
     options = KiroAgentOptions(allowed_tools=["Bash", "Read", "Write"])
@@ -65,7 +101,7 @@ async def test_build_command_with_tools():
 
 
 @pytest.mark.asyncio
-async def test_build_command_with_trust_all():
+async def test_build_command_with_trust_all(no_cli_on_path):
     """Test building command with trust_all_tools."""
     transport = KiroSubprocessTransport()
     options = KiroAgentOptions(trust_all_tools=True)
@@ -75,116 +111,136 @@ async def test_build_command_with_trust_all():
 
 
 @pytest.mark.asyncio
-async def test_build_command_with_verbose():
+async def test_build_command_with_verbose(no_cli_on_path):
     """Test building command with verbosity."""
     transport = KiroSubprocessTransport()
     options = KiroAgentOptions(verbose=2)
 
     cmd = transport._build_command(options)
-    # Should have two -v flags
-    assert cmd.count("-v") == 2
+    # Should have a stacked flag for verbosity 2
+    assert "-vv" in cmd
 
 
 @pytest.mark.asyncio
-async def test_start_creates_process():
+async def test_start_creates_process(fake_process, no_cli_on_path):
     """Test start() spawns subprocess."""
     transport = KiroSubprocessTransport()
     options = KiroAgentOptions()
+    process = fake_process()
 
-    # Mock subprocess creation
-    mock_process = MagicMock()
-    mock_process.stdin = MagicMock()
-    mock_process.stdout = MagicMock()
-    mock_process.stderr = MagicMock()
-
-    with patch("asyncio.create_subprocess_exec", return_value=mock_process) as mock_create:
+    with patch("asyncio.create_subprocess_exec", return_value=process) as mock_create:
         await transport.start(options)
 
-        assert transport.process == mock_process
+        assert transport.process is process
         mock_create.assert_called_once()
         # Verify command args
         call_args = mock_create.call_args[0]
         assert "kiro-cli" in call_args
         assert "chat" in call_args
+        # Backpressure configured on stdin
+        assert process.stdin.transport.write_buffer_limits == (0, None)
 
 
 @pytest.mark.asyncio
-async def test_stop_terminates_process():
+async def test_stop_terminates_process(fake_process):
     """Test stop() terminates subprocess gracefully."""
     transport = KiroSubprocessTransport()
+    process = fake_process()
+    transport.process = process
 
-    # Mock process
-    mock_process = MagicMock()
-    mock_process.terminate = MagicMock()
-    mock_process.wait = AsyncMock(return_value=0)
-    transport.process = mock_process
+    await transport.stop()
+
+    assert process.terminated
+    assert process.returncode == 0
+    assert not process.killed
+
+
+@pytest.mark.asyncio
+async def test_stop_noop_if_already_exited(fake_process):
+    """Test stop() doesn't signal a child that has already exited."""
+    transport = KiroSubprocessTransport()
+    process = fake_process()
+    process.returncode = 0  # Exited and reaped
+    transport.process = process
 
     await transport.stop()
 
-    mock_process.terminate.assert_called_once()
-    mock_process.wait.assert_awaited_once()
+    assert not process.terminated
+    assert not process.killed
 
 
 @pytest.mark.asyncio
-async def test_stop_kills_if_timeout():
+async def test_stop_kills_if_timeout(fake_process):
     """Test stop() kills process if termination times out."""
     transport = KiroSubprocessTransport()
+    transport.TERMINATE_TIMEOUT = 0.01  # Keep the test fast
 
-    # Mock process that doesn't terminate
-    mock_process = MagicMock()
-    mock_process.terminate = MagicMock()
-    mock_process.kill = MagicMock()
+    # Process that ignores terminate() but dies on kill()
+    class StubbornProcess(fake_process):
+        async def wait(self):
+            if self.killed:
+                self.returncode = -9
+                return self.returncode
+            await asyncio.sleep(10)  # Longer than timeout
 
-    async def wait_timeout():
-        await asyncio.sleep(10)  # Longer than timeout
-
-    mock_process.wait = AsyncMock(side_effect=wait_timeout)
-    transport.process = mock_process
+    process = StubbornProcess()
+    transport.process = process
 
     await transport.stop()
 
-    mock_process.terminate.assert_called_once()
-    mock_process.kill.assert_called_once()
+    assert process.terminated
+    assert process.killed
+    assert process.returncode == -9
 
 
 @pytest.mark.asyncio
-async def test_send_message():
+async def test_send_message(fake_process):
     """Test sending JSON message to CLI stdin."""
     transport = KiroSubprocessTransport()
+    process = fake_process()
+    transport.process = process
 
-    # Mock process with stdin
-    mock_stdin = MagicMock()
-    mock_stdin.write = MagicMock()
-    mock_stdin.drain = AsyncMock()
+    message = {"role": "user", "content": "Hello"}
+    await transport.send_message(message)
 
-    mock_process = MagicMock()
-    mock_process.stdin = mock_stdin
-    transport.process = mock_process
+    # Verify JSON was written (robust to encoder whitespace/ordering)
+    assert process.stdin.writes[-1] == b"\n"
+    assert json.loads(process.stdin.writes[0]) == message
+    assert process.stdin.drain_count == 1
+
+
+@pytest.mark.asyncio
+async def test_send_message_uses_module_codec(monkeypatch, fake_process):
+    """Test the send path goes through the module-level _dumps binding."""
+    from kiro_agent_sdk._internal.transport import subprocess_cli
+
+    encoded = []
+
+    def fake_dumps(obj):
+        encoded.append(obj)
+        return b"{}"
+
+    monkeypatch.setattr(subprocess_cli, "_dumps", fake_dumps)
+
+    transport = KiroSubprocessTransport()
+    transport.process = fake_process()
 
     message = {"role": "user", "content": "Hello"}
     await transport.send_message(message)
 
-    # Verify JSON was written
-    mock_stdin.write.assert_called_once()
-    written_data = mock_stdin.write.call_args[0][0]
-    assert b'"role": "user"' in written_data
-    assert b'"content": "Hello"' in written_data
-    mock_stdin.drain.assert_awaited_once()
+    assert encoded == [message]
 
 
 @pytest.mark.asyncio
-async def test_receive_messages():
+async def test_receive_messages(fake_process):
     """Test receiving JSON messages from CLI stdout."""
     transport = KiroSubprocessTransport()
-
-    # Mock process with stdout
-    async def mock_stdout():
-        yield b'{"role": "assistant", "content": "Hi"}\n'
-        yield b'{"role": "assistant", "content": "Bye"}\n'
-
-    mock_process = MagicMock()
-    mock_process.stdout = mock_stdout()
-    transport.process = mock_process
+    transport.process = fake_process(
+        stdout_data=(
+            b'{"role": "assistant", "content": "Hi"}\n'
+            b'{"role": "assistant", "content": "Bye"}\n'
+        )
+    )
 
     messages = []
     async for msg in transport.receive_messages():
@@ -197,19 +253,38 @@ async def test_receive_messages():
 
 
 @pytest.mark.asyncio
-async def test_receive_messages_skips_empty_lines():
-    """Test receive_messages skips empty lines."""
+async def test_receive_messages_across_chunk_boundaries(fake_process):
+    """Test the buffered reader reassembles lines split across chunks."""
     transport = KiroSubprocessTransport()
+    transport.process = fake_process(
+        stdout_data=(
+            b'{"role": "assistant", "content": "Hi"}\n'
+            b'{"role": "user", "content": "Bye"}\n'
+        ),
+        chunk_size=7,
+    )
+
+    messages = []
+    async for msg in transport.receive_messages():
+        messages.append(msg)
 
-    async def mock_stdout():
-        yield b'{"role": "assistant"}\n'
-        yield b'\n'  # Empty line
-        yield b'  \n'  # Whitespace only
-        yield b'{"role": "user"}\n'
+    assert len(messages) == 2
+    assert messages[0]["content"] == "Hi"
+    assert messages[1]["content"] == "Bye"
 
-    mock_process = MagicMock()
-    mock_process.stdout = mock_stdout()
-    transport.process = mock_process
+
+@pytest.mark.asyncio
+async def test_receive_messages_skips_empty_lines(fake_process):
+    """Test receive_messages skips empty lines."""
+    transport = KiroSubprocessTransport()
+    transport.process = fake_process(
+        stdout_data=(
+            b'{"role": "assistant"}\n'
+            b'\n'  # Empty line
+            b'  \n'  # Whitespace only
+            b'{"role": "user"}\n'
+        )
+    )
 
     messages = []
     async for msg in transport.receive_messages():
@@ -220,16 +295,10 @@ async def test_receive_messages_skips_empty_lines():
 
 
 @pytest.mark.asyncio
-async def test_receive_messages_raises_on_invalid_json():
+async def test_receive_messages_raises_on_invalid_json(fake_process):
     """Test receive_messages raises CLIJSONDecodeError on bad JSON."""
     transport = KiroSubprocessTransport()
-
-    async def mock_stdout():
-        yield b'{invalid json\n'
-
-    mock_process = MagicMock()
-    mock_process.stdout = mock_stdout()
-    transport.process = mock_process
+    transport.process = fake_process(stdout_data=b'{invalid json\n')
 
     with pytest.raises(CLIJSONDecodeError) as exc_info:
         async for msg in transport.receive_messages():
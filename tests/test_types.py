@@ -10,6 +10,8 @@ from kiro_agent_sdk.types import (
     ToolResultMessage,
     KiroAgentOptions,
     SessionInfo,
+    block_from_dict,
+    message_from_dict,
 )
 
 
@@ -89,6 +91,55 @@ def test_tool_result_message_creation():
     assert len(message.content) == 1
 
 
+def test_assistant_message_text_fastpath():
+    """Test the text property short-circuits the single-TextBlock shape."""
+    message = AssistantMessage(content=[TextBlock(text="Hello!")])
+    first = message.text
+    assert first == "Hello!"
+    # Cached: repeated access returns the same object, no re-join
+    assert message.text is first
+
+
+def test_message_text_joins_text_blocks():
+    """Test text concatenates TextBlocks and skips tool-use blocks."""
+    message = AssistantMessage(
+        content=[
+            TextBlock(text="Hello, "),
+            ToolUseBlock(id="t1", name="Bash", input={}),
+            TextBlock(text="world!"),
+        ]
+    )
+    assert message.text == "Hello, world!"
+
+
+def test_block_from_dict_dispatch():
+    """Test block_from_dict maps raw dicts via the type discriminator."""
+    block = block_from_dict({
+        "type": "tool_use",
+        "id": "t1",
+        "name": "Bash",
+        "input": {"command": "ls"}
+    })
+    assert isinstance(block, ToolUseBlock)
+    assert block.id == "t1"
+
+    text = block_from_dict({"type": "text", "text": "Hi"})
+    assert isinstance(text, TextBlock)
+    assert text.text == "Hi"
+
+
+def test_message_from_dict_dispatch():
+    """Test message_from_dict builds typed messages with typed blocks."""
+    message = message_from_dict({
+        "role": "tool_result",
+        "tool_use_id": "t1",
+        "content": [{"type": "text", "text": "done"}]
+    })
+    assert isinstance(message, ToolResultMessage)
+    assert message.tool_use_id == "t1"
+    assert isinstance(message.content[0], TextBlock)
+
+
 def test_kiro_agent_options_defaults():
     """Test KiroAgentOptions with all defaults."""
     options = KiroAgentOptions()
@@ -121,11 +172,21 @@ def test_kiro_agent_options_with_values():
     assert options.model == "claude-opus-4"
     assert options.max_turns == 5
     assert options.temperature == 0.7
-    assert options.allowed_tools == ["Bash", "Read"]
+    # Normalized to a tuple so options stay hashable
+    assert options.allowed_tools == ("Bash", "Read")
     assert options.cwd == Path("/tmp")
     assert options.verbose == 2
 
 
+def test_kiro_agent_options_command_key_precomputed():
+    """Test the argv-shaping fields are snapshotted once at construction."""
+    options = KiroAgentOptions(allowed_tools=["Bash", "Read"], verbose=1)
+    key = options._command_key
+    assert key == ("Bash,Read", False, None, 1)
+    # Precomputed, not rebuilt per access
+    assert options._command_key is key
+
+
 def test_session_info_creation():
     """Test SessionInfo dataclass."""
     session = SessionInfo(